@@ -1,13 +1,34 @@
+import hashlib
 import json
 import os
 from typing import cast
 import numpy as np
 from redis import Redis
+from langchain_community.cache import RedisCache
+from langchain_core.globals import set_llm_cache
 from langchain_openai import OpenAIEmbeddings
 
 CACHE_KEY_PREFIX = "rag:semantic:"
 DEFAULT_THRESHOLD = 0.92
 DEFAULT_TTL = 60 * 60 * 24 * 7  # 7일
+LLM_CACHE_TTL = 60 * 60 * 24  # 1일
+
+
+def setup_llm_cache() -> bool:
+    """Redis 기반 LLM 응답 캐시를 전역으로 설치합니다. 연결 실패 시 False를 반환합니다.
+
+    동일한 프롬프트(질문 + 검색 컨텍스트)와 모델 설정에 대한 노드 호출 결과를
+    프로세스 재시작 이후에도 재사용합니다.
+    """
+    redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
+    client = Redis.from_url(redis_url, decode_responses=True)
+    try:
+        client.ping()
+    except Exception:
+        return False
+
+    set_llm_cache(RedisCache(client, ttl=LLM_CACHE_TTL))
+    return True
 
 
 class SemanticCache:
@@ -30,6 +51,11 @@ class SemanticCache:
         except Exception:
             return False
 
+    def _key(self, question: str) -> str:
+        # 내장 hash()는 프로세스마다 시드가 달라 재시작 후 같은 질문이 새 키로 중복 저장됨
+        digest = hashlib.sha256(question.encode("utf-8")).hexdigest()
+        return f"{CACHE_KEY_PREFIX}{digest}"
+
     def _embed(self, text: str) -> list[float]:
         return self.embeddings.embed_query(text)
 
@@ -80,7 +106,7 @@ class SemanticCache:
 
         try:
             emb = self._embed(question)
-            key = f"{CACHE_KEY_PREFIX}{hash(question) & 0xFFFFFFFFFFFFFFFF}"
+            key = self._key(question)
             self.client.hset(key, mapping={  # type: ignore[arg-type]
                 "question": question,
                 "embedding": json.dumps(emb),
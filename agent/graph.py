@@ -1,8 +1,13 @@
+from functools import lru_cache
+
 from langgraph.graph import StateGraph, START, END
 
 from agent.state import AgentState
 from agent.nodes import rewrite_node, retrieve_node, generate_node, grade_docs_node
 
+# 최장 경로: retrieve → grade_docs → rewrite → retrieve → grade_docs → generate
+# (grade_docs_node가 is_rewritten으로 재작성을 1회로 제한하므로 노드 6 스텝 + 입력 스텝 1)
+RECURSION_LIMIT = 7
 
 def _decide_to_generate(state: AgentState) -> str:
     """grade_docs_node 이후 분기: 재작성 필요 여부에 따라 라우팅"""
@@ -11,8 +16,9 @@ def _decide_to_generate(state: AgentState) -> str:
     return "generate"
 
 
+@lru_cache(maxsize=1)
 def build_graph():
-    """LangGraph StateGraph를 조립하여 컴파일된 그래프를 반환"""
+    """LangGraph StateGraph를 조립하여 컴파일된 그래프를 반환 (토폴로지가 고정이므로 한 번만 컴파일)"""
     graph = StateGraph(AgentState)
 
     graph.add_node("retrieve", retrieve_node)
@@ -33,4 +39,4 @@ def build_graph():
     graph.add_edge("rewrite", "retrieve")
     graph.add_edge("generate", END)
 
-    return graph.compile()
+    return graph.compile().with_config(recursion_limit=RECURSION_LIMIT)
@@ -1,7 +1,10 @@
 import sys
 import os
+from functools import lru_cache
 from typing import Any, Optional, Literal
 
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.runnables import Runnable
 from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, Field
 
@@ -22,16 +25,70 @@ from agent.prompts import (
 # ──────────────────────────────────────────────
 class GradeOutput(BaseModel):
     should_rewrite: bool = Field(description="Whether the retrieved docs are insufficient and the query needs to be rewritten")
+    rewritten_query: Optional[str] = Field(default=None, description="Rewritten search query when should_rewrite is true, otherwise null")
+    category: Optional[str] = Field(default=None, description="The most relevant Spring documentation category when should_rewrite is true, otherwise null")
 
 class RewriteOutput(BaseModel):
     rewritten_query: str = Field(description="Rewritten search query optimized for semantic search")
     category: Optional[str] = Field(default=None, description="The most relevant Spring documentation category for filtering")
 
-class GenerateOutput(BaseModel):
-    answer: str = Field(description="Final answer to the user's question in Korean")
+# 재작성 결과 카테고리 검증용 (O(1) 조회)
+_CATEGORY_SET = frozenset(SUPPORTED_CATEGORIES)
+
+DEFAULT_MODEL = "gpt-5-mini"
+
+# 429/5xx/타임아웃/연결 오류 재시도 횟수 (OpenAI SDK의 지수 백오프 + 지터 사용, 기본값 2)
+LLM_MAX_RETRIES = 5
+
+# 스키마별 모델 (쿼리 재작성은 짧은 변환 작업이라 더 작은 모델로 충분)
+_MODELS = {
+    RewriteOutput: "gpt-5-nano",
+}
+
+# 판단/재작성은 출력이 짧은 분류성 작업이므로 추론 토큰을 최소화하여 디코딩 시간 단축
+_REASONING_EFFORT = {
+    GradeOutput: "minimal",
+    RewriteOutput: "minimal",
+}
+
+@lru_cache(maxsize=None)
+def _get_llm(
+    model: str = DEFAULT_MODEL,
+    temperature: float = 0,
+    reasoning_effort: Optional[str] = None,
+) -> ChatOpenAI:
+    """모델/온도별 ChatOpenAI 클라이언트를 하나만 만들어 노드 간 HTTP 커넥션 풀을 공유"""
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        reasoning_effort=reasoning_effort,
+        max_retries=LLM_MAX_RETRIES,
+    )
+
+@lru_cache(maxsize=None)
+def _get_structured_llm(schema: type[BaseModel]) -> Runnable:
+    """스키마별 structured output LLM을 한 번만 생성하여 재사용 (JSON 스키마 변환 1회)"""
+    llm = _get_llm(
+        _MODELS.get(schema, DEFAULT_MODEL),
+        reasoning_effort=_REASONING_EFFORT.get(schema),
+    )
+    return llm.with_structured_output(schema)
+
+# 출력 스키마별 프롬프트 (노드마다 하나의 체인)
+_PROMPTS = {
+    GradeOutput: GRADE_PROMPT,
+    RewriteOutput: REWRITE_PROMPT,
+}
 
-def _get_llm(temperature: float = 0) -> ChatOpenAI:
-    return ChatOpenAI(model="gpt-5-mini", temperature=temperature)
+@lru_cache(maxsize=None)
+def _get_chain(schema: type[BaseModel]) -> Runnable:
+    """프롬프트 | LLM 체인을 스키마별로 한 번만 구성하여 재사용"""
+    return _PROMPTS[schema] | _get_structured_llm(schema)
+
+@lru_cache(maxsize=1)
+def _get_generate_chain() -> Runnable:
+    """답변은 토큰 스트리밍이 가능하도록 structured output 대신 일반 텍스트로 생성"""
+    return GENERATE_PROMPT | _get_llm() | StrOutputParser()
 
 def _format_docs(docs: list) -> str:
     """검색 결과 문서를 컨텍스트 문자열로 포맷팅"""
@@ -58,39 +115,47 @@ def grade_docs_node(state: AgentState) -> dict[str, Any]:
     if state.get("is_rewritten", False):
         return {"should_rewrite": False}
 
-    llm = _get_llm().with_structured_output(GradeOutput)
-    chain = GRADE_PROMPT | llm
+    chain = _get_chain(GradeOutput)
 
-    context = _format_docs(state["documents"])
     result: GradeOutput = chain.invoke({
         "question": state["question"],
-        "context": context,
+        "context": state["context"],
     })
 
-    return {"should_rewrite": result.should_rewrite}
+    if not result.should_rewrite:
+        return {"should_rewrite": False}
+
+    # 판단과 재작성을 한 번의 호출로 처리하여 rewrite 노드의 LLM 왕복을 생략
+    return {
+        "should_rewrite": True,
+        "rewritten_query": result.rewritten_query,
+        "category": result.category,
+    }
 
 
 # ──────────────────────────────────────────────
 # Node 2: Rewrite
 #   - 정보가 부족할 때만 카테고리 추론 + 쿼리 최적화 수행
+#   - grade_docs에서 재작성 쿼리를 이미 받았다면 LLM 호출 없이 사용
 # ──────────────────────────────────────────────
 def rewrite_node(state: AgentState) -> dict[str, Any]:    
-    categories_str = "\n".join(f"  - {c}" for c in SUPPORTED_CATEGORIES)
-    
-    rewrite_llm = _get_llm().with_structured_output(RewriteOutput)
-    rewrite_chain = REWRITE_PROMPT | rewrite_llm
+    rewritten_query = state.get("rewritten_query")
+    category = state.get("category")
 
-    rewrite_result: RewriteOutput = rewrite_chain.invoke({
-        "question": state["question"],
-        "categories": categories_str,
-    })
+    if not rewritten_query:
+        rewrite_chain = _get_chain(RewriteOutput)
+
+        rewrite_result: RewriteOutput = rewrite_chain.invoke({
+            "question": state["question"],
+        })
+        rewritten_query = rewrite_result.rewritten_query
+        category = rewrite_result.category
 
-    category = rewrite_result.category
-    if category not in SUPPORTED_CATEGORIES:
+    if category not in _CATEGORY_SET:
         category = None
 
     return {
-        "rewritten_query": rewrite_result.rewritten_query,
+        "rewritten_query": rewritten_query,
         "category": category,
         "is_rewritten": True,
     }
@@ -109,22 +174,23 @@ def retrieve_node(state: AgentState) -> dict[str, Any]:
         k=5,
         category=category,
         use_reranker=True,
+        # 에이전트는 리랭커 장애 시에도 답변을 이어가도록 앙상블 결과로 대체
+        fallback_on_rerank_error=True,
     )
 
-    return {"documents": docs}
+    # grade/generate에서 같은 문서를 다시 포맷팅하지 않도록 컨텍스트 문자열을 한 번만 생성
+    return {"documents": docs, "context": _format_docs(docs)}
 
 # ──────────────────────────────────────────────
 # Node 4: Generate
 #   - 검색 결과를 바탕으로 최종 답변 생성
 # ──────────────────────────────────────────────
 def generate_node(state: AgentState) -> dict[str, Any]:
-    llm = _get_llm(temperature=0).with_structured_output(GenerateOutput)
-    chain = GENERATE_PROMPT | llm
+    chain = _get_generate_chain()
 
-    context = _format_docs(state["documents"])
-    result: GenerateOutput = chain.invoke({
+    answer: str = chain.invoke({
         "question": state["question"],
-        "context": context,
+        "context": state["context"],
     })
 
-    return {"answer": result.answer}
+    return {"answer": answer}
@@ -9,6 +9,9 @@ SUPPORTED_CATEGORIES = [
     "spring-cloud-gateway",
 ]
 
+# 프롬프트에 넣을 카테고리 목록 (Rewrite/Grade 프롬프트가 항상 같은 목록을 쓰도록 한 번만 생성)
+_CATEGORIES_TEXT = "\n".join(f"  - {c}" for c in SUPPORTED_CATEGORIES)
+
 # ──────────────────────────────────────────────
 # Rewrite Prompt
 #   - 검색에 최적화된 영어 쿼리로 변환
@@ -25,7 +28,10 @@ REWRITE_PROMPT = ChatPromptTemplate.from_messages([
         "Categories:\n{categories}"
     ),
     ("human", "{question}"),
-])
+]).partial(
+    # 카테고리 목록은 고정값이므로 시스템 프롬프트에 한 번만 채워둠
+    categories=_CATEGORIES_TEXT,
+)
 
 # ──────────────────────────────────────────────
 # Grade Prompt
@@ -37,13 +43,18 @@ GRADE_PROMPT = ChatPromptTemplate.from_messages([
         "You are a documentation quality grader for a Spring Framework RAG system.\n"
         "Given a user's question and a set of retrieved documents, determine if the documents contain enough information to provide a complete and accurate answer.\n"
         "If the information is missing, ambiguous, or irrelevant to the core question, mark 'should_rewrite' as true to trigger a query reformulation.\n"
-        "Only answer 'should_rewrite' as false if you are confident that the documents provide a direct answer."
+        "Only answer 'should_rewrite' as false if you are confident that the documents provide a direct answer.\n"
+        "If 'should_rewrite' is true, also rewrite the question into a concise English search query (under 20 words, Spring Framework terminology) "
+        "and return the most relevant category from the list below, or null if none is clearly implied. Otherwise leave both null.\n"
+        "Categories:\n{categories}"
     ),
     (
         "human",
         "Question: {question}\n\nRetrieved Context:\n{context}"
     ),
-])
+]).partial(
+    categories=_CATEGORIES_TEXT,
+)
 
 # ──────────────────────────────────────────────
 # Generate Prompt
@@ -10,4 +10,5 @@ class AgentState(TypedDict):
     should_rewrite: bool                # 쿼리 재작성 필요 여부 (재검색 결정 시 사용)
     is_rewritten: bool                  # 이미 재작성을 수행했는지 여부
     documents: list[Document]           # 검색된 문서 목록
+    context: str                        # 검색 문서를 프롬프트용으로 포맷팅한 문자열
     answer: str                         # 최종 답변
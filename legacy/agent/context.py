@@ -17,6 +17,8 @@ CODE_DIR = Path(__file__).resolve().parent.parent
 TOTAL_TOKEN_USAGE = 0
 INPUT_TOKEN_COUNT = 0
 OUTPUT_TOKEN_COUNT = 0
+# 입력 토큰 중 프롬프트 캐시에서 읽힌 토큰 수 (OpenAI 자동 프롬프트 캐싱)
+CACHED_INPUT_TOKEN_COUNT = 0
 
 # 서브 에이전트 실행 상태 추적
 sub_agent_running = False
\ No newline at end of file
@@ -1,3 +1,5 @@
+import uuid
+from functools import lru_cache
 from langchain.agents import create_agent
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, AIMessageChunk
@@ -13,16 +15,24 @@ from agent.ui import (
     print_separator,
 )
 
+@lru_cache(maxsize=1)
+def _get_model():
+    """서브 에이전트 호출마다 OpenAI 클라이언트를 새로 만들지 않도록 모델 인스턴스를 재사용"""
+    return ChatOpenAI(model="gpt-5-mini")
+
+
 class SubAgent:
     def __init__(self):
-        self.session_counter = 1
-        self.thread_id = f"sub_agent-{self.session_counter:03d}"
+        # 컴파일된 에이전트는 공유하고, 호출마다 새 thread_id로 빈 대화 기록에서 시작
+        self.thread_id = f"sub_agent-{uuid.uuid4().hex}"
         self.agent = self._create_my_agent()
         self.user_interrupted = False
 
-    def _create_my_agent(self):
-        """LangChain 에이전트를 생성하고 설정합니다."""
-        model = ChatOpenAI(model="gpt-5-mini")
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _create_my_agent():
+        """LangChain 에이전트를 생성하고 설정합니다. (위임마다 재컴파일하지 않도록 한 번만 생성)"""
+        model = _get_model()
 
         system_prompt = (
             "당신은 메인 에이전트의 실제 작업을 수행하는 하위 에이전트입니다. "
@@ -188,4 +198,6 @@ def sub_agent_tool(prompt: str) -> str:
     finally:
         # 서브 에이전트 실행 완료 플래그 해제
         agent_context.sub_agent_running = False
+        # 끝난 작업의 체크포인트는 다시 쓰이지 않으므로 공유 체크포인터에서 제거
+        agent.agent.checkpointer.delete_thread(agent.thread_id)
  
\ No newline at end of file
@@ -5,6 +5,7 @@ import time
 import shutil
 import os
 import sys
+from collections import deque
 from pathlib import Path
 
 from langchain_core.tools import tool
@@ -45,8 +46,9 @@ def _build_tree(directory: Path, prefix: str = "", max_depth: int = 6, current_d
     
     try:
         excluded_names = {'.git', '__pycache__', 'node_modules', '.venv', 'venv', '.idea', '.vscode'}
-        items = [item for item in sorted(directory.iterdir(), key=lambda x: (not x.is_dir(), x.name))
-                 if item.name not in excluded_names and not item.name.startswith('.')]
+        with os.scandir(directory) as it:
+            items = [item for item in it
+                     if item.name not in excluded_names and not item.name.startswith('.')]
     except PermissionError:
         return f"{prefix}└─ ... (접근 권한 없음)\n", 1
     
@@ -54,8 +56,9 @@ def _build_tree(directory: Path, prefix: str = "", max_depth: int = 6, current_d
     max_files_in_subdir = 4
     is_root = (current_depth == 0)
     
-    files = [item for item in items if item.is_file()]
-    dirs = [item for item in items if item.is_dir()]
+    # DirEntry는 스캔 시 얻은 파일 타입을 캐시하므로 항목마다 stat을 반복하지 않음
+    files = sorted((item for item in items if item.is_file()), key=lambda x: x.name)
+    dirs = sorted((item for item in items if item.is_dir()), key=lambda x: x.name)
     
     for i, item in enumerate(dirs):
         is_last_dir = (i == len(dirs) - 1) and len(files) == 0
@@ -64,7 +67,7 @@ def _build_tree(directory: Path, prefix: str = "", max_depth: int = 6, current_d
         item_count += 1
         
         extension = "   " if is_last_dir else "│  "
-        subtree, sub_count = _build_tree(item, prefix + extension, max_depth, current_depth + 1)
+        subtree, sub_count = _build_tree(Path(item.path), prefix + extension, max_depth, current_depth + 1)
         tree_lines.append(subtree)
         item_count += sub_count
     
@@ -204,7 +207,8 @@ def edit_file(filename: str, target_text: str, replacement_text: str) -> str:
         if not _request_approval(prompt_content):
             return "사용자가 파일 수정을 거부했습니다."
         
-        new_content = content.replace(target_text, replacement_text)
+        # target_text는 유일하므로 찾은 위치만 교체 (전체 재탐색 없이)
+        new_content = content[:start_index] + replacement_text + content[start_index + len(target_text):]
         target_path.write_text(new_content, encoding='utf-8')
         
         return f"수정 완료: {filename} ({start_line}번째 줄 수정됨)"
@@ -403,7 +407,7 @@ def list_background_processes() -> str:
     if not app or not app.background_processes:
         return "백그라운드 프로세스가 없습니다."
 
-    result = "백그라운드 프로세스 목록\n"
+    lines = ["백그라운드 프로세스 목록"]
     
     for i, bg_info in enumerate(app.background_processes, 1):
         proc = bg_info['process']
@@ -413,12 +417,13 @@ def list_background_processes() -> str:
         elapsed = int(time.time() - bg_info['start_time'])
         elapsed_str = f"{elapsed//60}분 {elapsed%60}초" if elapsed >= 60 else f"{elapsed}초"
         
-        result += f"{i}. PID: {bg_info['pid']} - {status}\n"
-        result += f"   명령어: {bg_info['command']}\n"
-        result += f"   로그: {bg_info['log_file']}\n"
-        result += f"   실행 시간: {elapsed_str}\n"
+        lines.append(f"{i}. PID: {bg_info['pid']} - {status}")
+        lines.append(f"   명령어: {bg_info['command']}")
+        lines.append(f"   로그: {bg_info['log_file']}")
+        lines.append(f"   실행 시간: {elapsed_str}")
     
-    return result
+    # 문자열 누적 대신 한 번에 조립
+    return "\n".join(lines) + "\n"
 
 @tool
 def view_terminal_log(log_file: str, lines: int = 50) -> str:
@@ -436,16 +441,24 @@ def view_terminal_log(log_file: str, lines: int = 50) -> str:
         if not log_path.exists():
             return f"로그 파일이 존재하지 않습니다: {log_file}"
         
+        # 파일 전체를 메모리에 올리지 않고 줄 단위로 읽으며 마지막 N줄만 유지
+        tail = deque(maxlen=lines)
+        total_lines = 0
         with open(log_path, 'rb') as f:
-            content = _decode_bytes_output(f.read())
+            for raw_line in f:
+                tail.append(raw_line.removesuffix(b'\n'))
+                total_lines += 1
+                last_line = raw_line
         
-        all_lines = content.split('\n')
+        # 빈 파일이거나 개행으로 끝나면 split('\n')과 동일하게 마지막 빈 줄을 포함
+        if total_lines == 0 or last_line.endswith(b'\n'):
+            tail.append(b'')
+            total_lines += 1
         
-        if len(all_lines) > lines:
-            selected_lines = all_lines[-lines:]
-            content = f"...(총 {len(all_lines)}줄 중 마지막 {lines}줄)\n" + "\n".join(selected_lines)
-        else:
-            content = "\n".join(all_lines)
+        content = _decode_bytes_output(b'\n'.join(tail))
+        
+        if total_lines > lines:
+            content = f"...(총 {total_lines}줄 중 마지막 {lines}줄)\n" + content
         
         if not content.strip():
             content = "(출력 없음)"
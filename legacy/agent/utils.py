@@ -1,6 +1,9 @@
+import atexit
 import platform
 import sys
+import threading
 from pathlib import Path
+from typing import TextIO
 import time
 from agent import context as agent_context
 
@@ -47,18 +50,40 @@ def is_safe_path(path_str: str, base_dir: Path) -> bool:
     except Exception:
         return False
 
+# 경로별로 열어둔 로그 파일 (매 로그마다 mkdir/open/close 시스템 콜 반복 방지)
+_log_files: dict[Path, TextIO] = {}
+_log_files_lock = threading.Lock()
+
+def _close_log_files():
+    """종료 시 열어둔 로그 파일을 모두 닫음"""
+    with _log_files_lock:
+        for log_file in _log_files.values():
+            log_file.close()
+        _log_files.clear()
+
+atexit.register(_close_log_files)
+
 def log_message(msg):
     timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
     try:
         log_path = agent_context.CODE_DIR / "temp_logs" / "chat_log.txt"
-        log_path.parent.mkdir(exist_ok=True)
-        with open(log_path, "a", encoding="utf-8") as log_file:
+        # 여러 스레드가 동시에 첫 로그를 남겨도 파일을 한 번만 열고, 줄 단위 쓰기가 섞이지 않도록 잠금
+        with _log_files_lock:
+            log_file = _log_files.get(log_path)
+            if log_file is None:
+                log_path.parent.mkdir(exist_ok=True)
+                log_file = _log_files[log_path] = open(log_path, "a", encoding="utf-8")
             log_file.write(f"[{timestamp}] {str(msg)}\n")
+            log_file.flush()
     except Exception as e:
         print(f"[로그 저장 실패: {e}]")
 
 def update_token_usage(msg):
-    if hasattr(msg, "usage_metadata") and msg.usage_metadata:
-        agent_context.TOTAL_TOKEN_USAGE += msg.usage_metadata.get("total_tokens", 0)
-        agent_context.INPUT_TOKEN_COUNT += msg.usage_metadata.get("input_tokens", 0)
-        agent_context.OUTPUT_TOKEN_COUNT += msg.usage_metadata.get("output_tokens", 0)
+    # 스트리밍 청크마다 호출되므로 usage_metadata는 한 번만 조회
+    usage = getattr(msg, "usage_metadata", None)
+    if not usage:
+        return
+    agent_context.TOTAL_TOKEN_USAGE += usage.get("total_tokens", 0)
+    agent_context.INPUT_TOKEN_COUNT += usage.get("input_tokens", 0)
+    agent_context.OUTPUT_TOKEN_COUNT += usage.get("output_tokens", 0)
+    agent_context.CACHED_INPUT_TOKEN_COUNT += (usage.get("input_token_details") or {}).get("cache_read", 0)
@@ -172,11 +172,13 @@ class AgentApp:
         
         # 토큰 사용량 출력
         print(f"\n{Fore.CYAN}입력 토큰 수: {agent_context.INPUT_TOKEN_COUNT}{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}캐시된 입력 토큰 수: {agent_context.CACHED_INPUT_TOKEN_COUNT}{Style.RESET_ALL}")
         print(f"{Fore.CYAN}출력 토큰 수: {agent_context.OUTPUT_TOKEN_COUNT}{Style.RESET_ALL}")
         print(f"{Fore.CYAN}총 토큰 사용량: {agent_context.TOTAL_TOKEN_USAGE}{Style.RESET_ALL}")
 
         log_message(f"APPLICATION: 총 토큰 사용량: {agent_context.TOTAL_TOKEN_USAGE}")
         log_message(f"APPLICATION: 입력 토큰 수: {agent_context.INPUT_TOKEN_COUNT}")
+        log_message(f"APPLICATION: 캐시된 입력 토큰 수: {agent_context.CACHED_INPUT_TOKEN_COUNT}")
         log_message(f"APPLICATION: 출력 토큰 수: {agent_context.OUTPUT_TOKEN_COUNT}")    
                 
     
@@ -13,7 +13,7 @@ load_dotenv()
 init(autoreset=True)
 
 from agent import build_graph
-from agent.cache import SemanticCache
+from agent.cache import SemanticCache, setup_llm_cache
 
 
 BANNER = f"""{Fore.CYAN}
@@ -23,6 +23,8 @@ BANNER = f"""{Fore.CYAN}
 ╚══════════════════════════════════════════════════════╝
 {Style.RESET_ALL}"""
 
+EXIT_COMMANDS = frozenset({"exit", "quit", "q"})
+
 CATEGORY_LABELS = {
     "spring-boot": "Spring Boot",
     "spring-data-jpa": "Spring Data JPA",
@@ -46,6 +48,9 @@ def run():
     else:
         print(f"{Fore.YELLOW}[Cache] Redis 연결 실패 - 캐시 없이 실행됩니다{Style.RESET_ALL}")
 
+    if setup_llm_cache():
+        print(f"{Fore.CYAN}[Cache] LLM 응답 캐시 활성화{Style.RESET_ALL}")
+
     print(BANNER)
 
     while True:
@@ -54,7 +59,7 @@ def run():
 
             if not user_input:
                 continue
-            if user_input.lower() in ("exit", "quit", "q"):
+            if user_input.lower() in EXIT_COMMANDS:
                 print(f"\n{Fore.YELLOW}Goodbye!{Style.RESET_ALL}")
                 break
 
@@ -78,7 +83,20 @@ def run():
 
             final_answer = ""
 
-            for step_output in graph.stream(state, stream_mode="updates"):
+            answer_started = False
+
+            # updates: 노드별 진행 상황 / messages: generate 노드의 답변 토큰 스트림
+            for mode, chunk in graph.stream(state, stream_mode=["updates", "messages"]):
+                if mode == "messages":
+                    message, metadata = chunk
+                    if metadata.get("langgraph_node") == "generate" and message.content:
+                        if not answer_started:
+                            print(f"\n{Fore.YELLOW}Agent:{Style.RESET_ALL}")
+                            answer_started = True
+                        print(message.content, end="", flush=True)
+                    continue
+
+                step_output = chunk
                 node_name = list(step_output.keys())[0]
                 node_result = step_output[node_name]
 
@@ -103,7 +121,11 @@ def run():
 
                 elif node_name == "generate":
                     final_answer = node_result.get("answer", "")
-                    print(f"\n{Fore.YELLOW}Agent:{Style.RESET_ALL}\n{final_answer}\n")
+                    if answer_started:
+                        print("\n")
+                    else:
+                        # messages 스트림으로 토큰이 출력되지 않은 경우의 안전장치로 한 번에 출력
+                        print(f"\n{Fore.YELLOW}Agent:{Style.RESET_ALL}\n{final_answer}\n")
 
             # 답변 생성 후 캐시 저장
             if final_answer:
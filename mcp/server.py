@@ -11,12 +11,22 @@ os.chdir(PROJECT_ROOT)
 load_dotenv(Path(__file__).parent.parent / ".env")
 
 from mcp.server.fastmcp import FastMCP
-from pipeline.retriever import query_hybrid
+from pipeline.retriever import aquery_hybrid
+
+try:
+    # orjson이 있으면 사용 (UTF-8 그대로 출력, 공백 없는 직렬화로 응답 토큰도 감소)
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _dumps(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False)
 
 mcp = FastMCP("spring_docs")
 
 @mcp.tool()
-def get_docs(query: str, category: str = None) -> str:
+async def get_docs(query: str, category: str = None) -> str:
     """
     Get documents for a query.
     Supported documentation categories:
@@ -41,7 +51,7 @@ def get_docs(query: str, category: str = None) -> str:
     Returns:
         List of documents.
     """
-    docs = query_hybrid(query, k=5, category=category, use_reranker=False)
+    docs = await aquery_hybrid(query, k=5, category=category, use_reranker=False)
     results = [
         {
             "page_content": doc.page_content,
@@ -49,10 +59,10 @@ def get_docs(query: str, category: str = None) -> str:
         }
         for doc in docs
     ]
-    return json.dumps(results, ensure_ascii=False)
+    return _dumps(results)
 
 @mcp.tool()
-def get_docs_with_reranker(query: str, category: str = None) -> str:
+async def get_docs_with_reranker(query: str, category: str = None) -> str:
     """
     Get documents for a query.
     Supported documentation categories:
@@ -78,7 +88,7 @@ def get_docs_with_reranker(query: str, category: str = None) -> str:
     Returns:
         List of documents.
     """
-    docs = query_hybrid(query, k=5, category=category, use_reranker=True)
+    docs = await aquery_hybrid(query, k=5, category=category, use_reranker=True, fallback_on_rerank_error=True)
     results = [
         {
             "page_content": doc.page_content,
@@ -86,7 +96,7 @@ def get_docs_with_reranker(query: str, category: str = None) -> str:
         }
         for doc in docs
     ]
-    return json.dumps(results, ensure_ascii=False)
+    return _dumps(results)
 
 
 if __name__ == "__main__":
@@ -4,6 +4,9 @@ from urllib.parse import urljoin, urlparse
 from markdownify import markdownify as md
 import re
 import os
+import logging
+
+logger = logging.getLogger(__name__)
 
 headers = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
@@ -30,7 +33,7 @@ def get_content(url):
         return text.strip()
         
     except Exception as e:
-        print(f"    Error: {e}")
+        logger.warning("    Error: %s", e)
         return ""
     return ""
 
@@ -107,7 +110,7 @@ def fetch_docs(start_url="https://docs.spring.io/spring-boot/reference/", max_pa
 
     for i, url in enumerate(links_list, 1):
         filepath_name = extract_path_from_url(url)
-        print(f"[{i}/{len(links_list)}] {filepath_name}", flush=True)
+        logger.info("[%d/%d] %s", i, len(links_list), filepath_name)
         
         markdown_text = get_content(url)
         
@@ -133,12 +136,16 @@ def fetch_docs(start_url="https://docs.spring.io/spring-boot/reference/", max_pa
 
             yield {'url': url, 'content': markdown_text}
         else:
-            print(f"  ✗ Content too short or empty")
+            logger.warning("  ✗ Content too short or empty: %s", url)
     
     print("\n" + "="*80)
     print(f"Completed: {success_count}/{len(links_list)} pages saved")
 
 
 if __name__ == "__main__":
+    # 파이프라인 로그만 LOG_LEVEL로 출력 (httpx 등 라이브러리의 요청별 INFO 로그는 WARNING 이상만)
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    for name in ("pipeline", "__main__"):
+        logging.getLogger(name).setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
     for _ in fetch_docs(max_pages=100):
         pass
@@ -1,8 +1,12 @@
 import os
 import sys
+import json
+import time
 import random
 import concurrent.futures
 import warnings
+import tiktoken
+from functools import lru_cache
 from tqdm import tqdm
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
@@ -17,8 +21,10 @@ ROOT_DIR = Path(__file__).parent.parent.parent.parent
 sys.path.append(str(ROOT_DIR))
 
 from langsmith import Client
+from openai import OpenAI
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import PromptTemplate
+from langchain_core.utils.function_calling import convert_to_openai_function
 
 # Import storage to get VectorStore directly
 from pipeline.storage import get_vectorstore
@@ -26,6 +32,23 @@ from pipeline.storage import get_vectorstore
 # 환경 변수 로드
 load_dotenv()
 
+# 프롬프트에 넣을 청크 최대 토큰 수 (기존 15000자 ≈ 3~4천 토큰)
+MAX_CHUNK_TOKENS = 4000
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """BPE 파일 로드(최초 1회 다운로드)를 실제로 자를 때까지 지연"""
+    return tiktoken.get_encoding("o200k_base")
+
+def truncate_to_tokens(text: str, max_tokens: int = MAX_CHUNK_TOKENS) -> str:
+    """문자 수가 아닌 토큰 수 기준으로 텍스트를 자름"""
+    encoding = _get_encoding()
+    # 문서 본문의 <|endoftext|> 등은 특수 토큰이 아닌 일반 텍스트로 인코딩
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
 class QAPair(BaseModel):
     question: str = Field(description="Generated question strictly based on the text")
     answer: str = Field(description="Ground truth answer to the question explicitly stated in the text")
@@ -33,15 +56,7 @@ class QAPair(BaseModel):
 class QAPairs(BaseModel):
     pairs: List[QAPair] = Field(description="List of QA pairs. Can be empty if the text lacks sufficient information.")
 
-def generate_qa_pairs_from_chunk(content: str, max_pairs: int = 1) -> List[QAPair]:
-    """
-    LLM을 사용하여 텍스트에서 고난도 Q&A 쌍을 추출합니다.
-    어휘적 중복을 최소화하고 추상화된 질문을 생성하도록 유도합니다.
-    """
-    
-    llm = ChatOpenAI(model="gpt-5-mini", temperature=0.4)
-
-    prompt = """
+QA_PROMPT = """
     당신은 Retrieval 시스템의 성능을 극한으로 테스트하기 위한 **최상위 난이도(Very Hard)** 데이터셋 생성 전문가입니다.
 
     웹 문서에서 추출된 하나의 텍스트 청크가 주어집니다.
@@ -71,13 +86,23 @@ def generate_qa_pairs_from_chunk(content: str, max_pairs: int = 1) -> List[QAPai
     Text:
     {text}
     """
-    
-    prompt_template = PromptTemplate.from_template(prompt)
-    chain = prompt_template | llm.with_structured_output(QAPairs)
+
+@lru_cache(maxsize=1)
+def _get_qa_chain():
+    """QA 생성 체인(프롬프트 파싱 + structured output 바인딩)을 한 번만 구성"""
+    llm = ChatOpenAI(model="gpt-5-mini", temperature=0.4)
+    return PromptTemplate.from_template(QA_PROMPT) | llm.with_structured_output(QAPairs)
+
+def generate_qa_pairs_from_chunk(content: str, max_pairs: int = 1) -> List[QAPair]:
+    """
+    LLM을 사용하여 텍스트에서 고난도 Q&A 쌍을 추출합니다.
+    어휘적 중복을 최소화하고 추상화된 질문을 생성하도록 유도합니다.
+    """
+    chain = _get_qa_chain()
     
     try:
-        # 텍스트가 너무 길 경우 자름
-        truncated_content = content[:15000] if len(content) > 15000 else content
+        # 텍스트가 너무 길 경우 토큰 단위로 자름
+        truncated_content = truncate_to_tokens(content)
         result = chain.invoke({"text": truncated_content, "max_pairs": max_pairs})
         
         return result.pairs[:max_pairs]
@@ -85,10 +110,90 @@ def generate_qa_pairs_from_chunk(content: str, max_pairs: int = 1) -> List[QAPai
         print(f"Q&A 생성 중 오류 발생: {e}")
         return []
 
+# Batch API 폴링 간격 (초): 지수 백오프로 최대값까지 증가
+BATCH_POLL_INITIAL = 10
+BATCH_POLL_MAX = 300
+_BATCH_DONE_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+def generate_qa_pairs_batch(contents: List[str], max_pairs: int = 1) -> List[List[QAPair]]:
+    """
+    OpenAI Batch API로 여러 청크의 Q&A 쌍을 한 번에 생성합니다.
+    실시간 호출 대비 비용이 절반이고 rate limit에 걸리지 않지만, 완료까지 최대 24시간이 걸릴 수 있습니다.
+    """
+    client = OpenAI()
+    # strict 모드 호환 스키마 (additionalProperties: false, 전 필드 required)로 출력 형식을 QAPairs에 고정
+    schema = convert_to_openai_function(QAPairs, strict=True)["parameters"]
+
+    results: List[List[QAPair]] = [[] for _ in contents]
+    lines = []
+    for i, content in enumerate(contents):
+        try:
+            prompt = QA_PROMPT.format(text=truncate_to_tokens(content), max_pairs=max_pairs)
+        except Exception as e:
+            # 문제 청크 하나 때문에 전체 배치 제출이 중단되지 않도록 건너뜀
+            print(f"Batch 요청 생성 중 오류 발생 (chunk-{i}): {e}")
+            continue
+        lines.append(json.dumps({
+            "custom_id": f"chunk-{i}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": "gpt-5-mini",
+                "messages": [{"role": "user", "content": prompt}],
+                "response_format": {
+                    "type": "json_schema",
+                    "json_schema": {"name": "QAPairs", "schema": schema, "strict": True},
+                },
+            },
+        }, ensure_ascii=False))
+
+    if not lines:
+        return results
+
+    batch_file = client.files.create(
+        file=("qa_batch.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch",
+    )
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    print(f"Batch 작업 제출 완료: {batch.id} ({len(lines)}개 요청)")
+
+    delay = BATCH_POLL_INITIAL
+    while batch.status not in _BATCH_DONE_STATUSES:
+        time.sleep(delay)
+        delay = min(delay * 2, BATCH_POLL_MAX)
+        batch = client.batches.retrieve(batch.id)
+        # validating 단계에서는 request_counts가 아직 없을 수 있음
+        counts = batch.request_counts
+        progress = f" ({counts.completed}/{counts.total})" if counts else ""
+        print(f"Batch 상태: {batch.status}{progress}")
+
+    if batch.status != "completed" or not batch.output_file_id:
+        print(f"Batch 작업 실패: {batch.status}")
+        return results
+
+    # 결과 순서는 보장되지 않으므로 custom_id로 매칭
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+            idx = int(item["custom_id"].removeprefix("chunk-"))
+            message = item["response"]["body"]["choices"][0]["message"]["content"]
+            results[idx] = QAPairs.model_validate_json(message).pairs[:max_pairs]
+        except Exception as e:
+            print(f"Batch 결과 파싱 중 오류 발생: {e}")
+
+    return results
+
 def create_dataset_from_crawled_md(
     collection_name: str = "spring_docs", 
     num_samples: int = 50, 
-    max_pairs_per_chunk: int = 1
+    max_pairs_per_chunk: int = 1,
+    use_batch: bool = False
 ):
     print(f"=== VectorStore({collection_name}) 기반 고난도 평가용 데이터셋 구축 시작 (대상: {num_samples}개 청크) ===")
     
@@ -137,13 +242,11 @@ def create_dataset_from_crawled_md(
     dataset_records = []
 
 
-    def process_chunk(idx):
+    def to_qa_items(idx, qa_pairs):
         content = documents[idx]
         metadata = metadatas[idx] if metadatas else {}
         doc_id = ids[idx] if ids else f"chunk_{idx}"
         
-        qa_pairs = generate_qa_pairs_from_chunk(content, max_pairs=max_pairs_per_chunk)
-        
         all_qa_pairs = []
         for pair in qa_pairs:
             all_qa_pairs.append({
@@ -157,26 +260,37 @@ def create_dataset_from_crawled_md(
             
         return all_qa_pairs
 
-    # 병렬 처리로 속도 향상
+    def process_chunk(idx):
+        qa_pairs = generate_qa_pairs_from_chunk(documents[idx], max_pairs=max_pairs_per_chunk)
+        return to_qa_items(idx, qa_pairs)
+
+    def add_records(qa_data):
+        for item in qa_data:
+            dataset_records.append({
+                "question": item["question"],
+                "expected_answer": item["answer"],
+                "context": item["chunk_content"],
+                "source": f"{item['source']}"
+            })
+
     print(f"LLM을 사용하여 Q&A 쌍을 평가 및 생성하는 중... (청크당 최대 {max_pairs_per_chunk}개)")
-    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-        future_to_chunk = {executor.submit(process_chunk, idx): idx for idx in sampled_indices}
-
-        for future in tqdm(concurrent.futures.as_completed(future_to_chunk), total=len(sampled_indices), desc="Generating Q&A"):
-            try:
-                qa_data = future.result()
-                if not qa_data:
-                    continue
-                
-                for item in qa_data:
-                    dataset_records.append({
-                        "question": item["question"],
-                        "expected_answer": item["answer"],
-                        "context": item["chunk_content"],
-                        "source": f"{item['source']}"
-                    })
-            except Exception as e:
-                print(f"병렬 처리 중 예외 발생: {e}")
+    if use_batch:
+        # 오프라인 실행: Batch API로 한 번에 제출 (비용 절감, rate limit 회피)
+        batch_results = generate_qa_pairs_batch(
+            [documents[idx] for idx in sampled_indices], max_pairs=max_pairs_per_chunk
+        )
+        for idx, qa_pairs in zip(sampled_indices, batch_results):
+            add_records(to_qa_items(idx, qa_pairs))
+    else:
+        # 병렬 처리로 속도 향상
+        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
+            future_to_chunk = {executor.submit(process_chunk, idx): idx for idx in sampled_indices}
+
+            for future in tqdm(concurrent.futures.as_completed(future_to_chunk), total=len(sampled_indices), desc="Generating Q&A"):
+                try:
+                    add_records(future.result())
+                except Exception as e:
+                    print(f"병렬 처리 중 예외 발생: {e}")
 
     if not dataset_records:
         print("경고: 생성된 Q&A 쌍이 하나도 없습니다. 문서 내용이 모두 부실하거나 오류가 발생했을 수 있습니다.")
@@ -206,4 +320,5 @@ def create_dataset_from_crawled_md(
 
 if __name__ == "__main__":
     # 데이터셋 구성 인자: num_samples=50 (50개 청크 랜덤추출), max_pairs_per_chunk=1
-    create_dataset_from_crawled_md(num_samples=50, max_pairs_per_chunk=1)
+    # --batch: OpenAI Batch API 사용 (비용 50% 절감, 완료까지 대기 필요)
+    create_dataset_from_crawled_md(num_samples=50, max_pairs_per_chunk=1, use_batch="--batch" in sys.argv)
@@ -1,6 +1,7 @@
 import os
 import sys
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 # 프로젝트 루트를 경로에 추가
@@ -14,6 +15,7 @@ from pipeline.retriever import query_hybrid
 from openevals.prompts import CORRECTNESS_PROMPT, RAG_GROUNDEDNESS_PROMPT, RAG_RETRIEVAL_RELEVANCE_PROMPT
 from openevals.llm import create_llm_as_judge
 from agent.graph import build_graph
+from agent.cache import setup_llm_cache
 
 load_dotenv()
 
@@ -153,27 +155,35 @@ def run_evaluation():
     
     evaluators = [correctness, groundedness, retrieval_relevance]
 
-    # 1. Agentic RAG 평가
-    print("\n1. Agentic RAG (Advanced Agent) 평가 중...")
-    evaluate(
-        predict_agentic_rag,
-        data=dataset_name,
-        evaluators=evaluators,
-        experiment_prefix="Agentic-RAG-Hard_v2",
-        max_concurrency=5
-    )
-
-    # 2. Simple RAG 평가
-    print("\n2. Simple RAG (Basic Chain) 평가 중...")
-    evaluate(
-        predict_simple_rag,
-        data=dataset_name,
-        evaluators=evaluators,
-        experiment_prefix="Simple-RAG-Hard",
-        max_concurrency=5
-    )
+    experiments = [
+        ("1. Agentic RAG (Advanced Agent)", predict_agentic_rag, "Agentic-RAG-Hard_v2"),
+        ("2. Simple RAG (Basic Chain)", predict_simple_rag, "Simple-RAG-Hard"),
+    ]
+
+    # 두 실험은 데이터셋만 공유하고 서로 의존성이 없으므로 동시에 실행
+    with ThreadPoolExecutor(max_workers=len(experiments)) as executor:
+        futures = []
+        for label, target, experiment_prefix in experiments:
+            print(f"\n{label} 평가 중...")
+            futures.append(executor.submit(
+                evaluate,
+                target,
+                data=dataset_name,
+                evaluators=evaluators,
+                experiment_prefix=experiment_prefix,
+                max_concurrency=5,
+            ))
+
+        for future in futures:
+            future.result()
     
     print("\n✅ 모든 평가가 완료되었습니다. LangSmith에서 결과를 비교해보세요.")
 
 if __name__ == "__main__":
+    # --cache: 반복 실행 시 동일 프롬프트(에이전트 노드 + Judge)의 LLM 응답을 Redis에서 재사용
+    if "--cache" in sys.argv:
+        if setup_llm_cache():
+            print("[Cache] LLM 응답 캐시 활성화")
+        else:
+            print("[Cache] Redis 연결 실패 - 캐시 없이 실행됩니다")
     run_evaluation()
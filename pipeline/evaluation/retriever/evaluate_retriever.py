@@ -6,6 +6,7 @@ from dotenv import load_dotenv
 from pydantic import BaseModel
 from typing import List
 from datetime import datetime
+from functools import lru_cache
 
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 sys.path.append(project_root)
@@ -60,13 +61,7 @@ def get_random_chunks(n=10):
 class Questions(BaseModel):
     questions: List[str]
 
-def generate_questions(chunk_content):
-    """
-    Uses LLM to generate 3 challenging questions based on the provided text chunk.
-    """
-    llm = ChatOpenAI(model="gpt-5-mini", temperature=0.5)
-
-    prompt = """
+QUESTION_PROMPT = """
     당신은 Retrieval 시스템을 평가하기 위한 데이터셋을 생성하는 전문가입니다.
 
     웹 문서에서 추출된 하나의 텍스트 청크가 주어집니다.
@@ -97,11 +92,18 @@ def generate_questions(chunk_content):
 
     {text}
     """
-    
-    prompt = PromptTemplate.from_template(prompt)
-    
-    chain = prompt | llm.with_structured_output(Questions)
-    questions = chain.invoke({"text": chunk_content})
+
+@lru_cache(maxsize=1)
+def _get_question_chain():
+    """질문 생성 체인(프롬프트 파싱 + structured output 바인딩)을 한 번만 구성"""
+    llm = ChatOpenAI(model="gpt-5-mini", temperature=0.5)
+    return PromptTemplate.from_template(QUESTION_PROMPT) | llm.with_structured_output(Questions)
+
+def generate_questions(chunk_content):
+    """
+    Uses LLM to generate 3 challenging questions based on the provided text chunk.
+    """
+    questions = _get_question_chain().invoke({"text": chunk_content})
 
     return questions.questions
 
@@ -174,53 +176,63 @@ def run_evaluation(num_samples=10, max_k=10):
     } for m in methods}
     
     total_questions = 0
-    
-    for i, (item, questions) in enumerate(tqdm(chunk_questions_map, desc="Retrieval Testing")):
+
+    # 질문 × 검색 방식 조합은 서로 독립적인 네트워크 I/O(임베딩/리랭크)이므로 동시에 실행
+    retrieval_jobs = []
+    for i, (item, questions) in enumerate(chunk_questions_map):
         metadata = item['metadata']
-        
         expected_chunk_id = metadata.get("chunk_id")
         expected_source = metadata.get("source", "Unknown")
-        
         for q_idx, question in enumerate(questions):
+            for method in methods:
+                retrieval_jobs.append((i, q_idx, question, expected_chunk_id, expected_source, method))
+
+    def run_retrieval_job(job):
+        _, _, question, expected_chunk_id, expected_source, method = job
+        # 2. Evaluate Retrieval (Fetch up to max_k, e.g., 50)
+        return evaluate_retrieval(question, expected_chunk_id, expected_source, method=method, k=max_k)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
+        # map은 입력 순서를 유지하므로 결과 로그 순서가 기존과 동일
+        ranks = list(tqdm(executor.map(run_retrieval_job, retrieval_jobs), total=len(retrieval_jobs), desc="Retrieval Testing"))
+
+    for (i, q_idx, question, _, expected_source, method), rank in zip(retrieval_jobs, ranks):
+        if method == methods[0]:
             total_questions += 1
+
+        # 3. Calculate Metrics
+        # --- Top 1 Metrics ---
+        is_hit_1 = rank == 1
+        if is_hit_1:
+            all_metrics[method]["hits_1"] += 1
+
+        # --- Top 5 Metrics ---
+        is_hit_5 = 0 < rank <= 5
+        if is_hit_5:
+            all_metrics[method]["hits_5"] += 1
+            all_metrics[method]["mrr_sum_5"] += 1.0 / rank
+
+        # --- Top 10 Metrics ---
+        is_hit_10 = 0 < rank <= 10
+        if is_hit_10:
+            all_metrics[method]["hits_10"] += 1
+            all_metrics[method]["mrr_sum_10"] += 1.0 / rank
+
+        # --- Top max_k Metrics ---
+        is_hit_max_k = 0 < rank <= max_k
+        if is_hit_max_k:
+            all_metrics[method]["hits_max_k"] += 1
+            all_metrics[method]["mrr_sum_max_k"] += 1.0 / rank
             
-            for method in methods:
-                # 2. Evaluate Retrieval (Fetch up to max_k, e.g., 50)
-                rank = evaluate_retrieval(question, expected_chunk_id, expected_source, method=method, k=max_k)
-                
-                # 3. Calculate Metrics
-                # --- Top 1 Metrics ---
-                is_hit_1 = rank == 1
-                if is_hit_1:
-                    all_metrics[method]["hits_1"] += 1
-
-                # --- Top 5 Metrics ---
-                is_hit_5 = 0 < rank <= 5
-                if is_hit_5:
-                    all_metrics[method]["hits_5"] += 1
-                    all_metrics[method]["mrr_sum_5"] += 1.0 / rank
-
-                # --- Top 10 Metrics ---
-                is_hit_10 = 0 < rank <= 10
-                if is_hit_10:
-                    all_metrics[method]["hits_10"] += 1
-                    all_metrics[method]["mrr_sum_10"] += 1.0 / rank
-
-                # --- Top max_k Metrics ---
-                is_hit_max_k = 0 < rank <= max_k
-                if is_hit_max_k:
-                    all_metrics[method]["hits_max_k"] += 1
-                    all_metrics[method]["mrr_sum_max_k"] += 1.0 / rank
-                    
-                # Log result for this question
-                all_metrics[method]["results_log"].append({
-                    "chunk_idx": i + 1,
-                    "q_idx": q_idx + 1,
-                    "question": question,
-                    "expected_source": expected_source,
-                    "rank": rank,
-                })
-        
+        # Log result for this question
+        all_metrics[method]["results_log"].append({
+            "chunk_idx": i + 1,
+            "q_idx": q_idx + 1,
+            "question": question,
+            "expected_source": expected_source,
+            "rank": rank,
+        })
+
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     import os
     os.makedirs("results", exist_ok=True)
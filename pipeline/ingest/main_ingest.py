@@ -2,8 +2,16 @@ import sys
 import os
 import asyncio
 import hashlib
+import logging
 from dotenv import load_dotenv
 from tqdm.asyncio import tqdm
+from tqdm.contrib.logging import logging_redirect_tqdm
+
+try:
+    # uvicorn[standard] 경유로 설치되는 uvloop이 있으면 태스크 스케줄링 오버헤드가 적은 루프 사용 (Windows 미지원)
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # 프로젝트 루트를 sys.path에 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -12,19 +20,26 @@ from pipeline.crawler import fetch_docs
 from pipeline.processor.processor import chunk_markdown_content
 from pipeline.storage import add_documents
 
+logger = logging.getLogger(__name__)
+
+# 동시에 처리할 페이지 수 (임베딩 API 한도에 맞춰 INGEST_CONCURRENCY로 조정)
+DEFAULT_CONCURRENCY = 5
+# 저장(임베딩) 실패 페이지 재시도 횟수 (실패한 페이지만 다시 처리)
+MAX_RETRIES = 2
+
 async def process_page(sem, page, category):
     """
     Async task to process a single page: Parsing -> Chunking -> Storage
+    Returns the page if storage failed (retryable), otherwise None.
     """
     url_link = page['url']
     content = page['content']  # Markdown format
     
     async with sem:
-        tqdm.write(f"  > [Start] Processing: {url_link}")
         try:
             chunks = chunk_markdown_content(content)
         except Exception as e:
-            tqdm.write(f"  ! [Error] Failed to chunk {url_link}: {e}")
+            logger.warning("  ! [Error] Failed to chunk %s: %s", url_link, e)
             return
 
         for i, chunk in enumerate(chunks):
@@ -32,33 +47,71 @@ async def process_page(sem, page, category):
             chunk.metadata["category"] = category
             chunk.metadata["chunk_id"] = hashlib.md5(f"{url_link}#{i}".encode()).hexdigest()
             
-        tqdm.write(f"  - [Done] Created {len(chunks)} chunks from {url_link}")
+        # 페이지당 로그는 한 줄만 남김 (LOG_LEVEL=WARNING이면 생략)
+        logger.info("  - [Done] Created %d chunks from %s", len(chunks), url_link)
 
         if chunks:
-            await asyncio.to_thread(add_documents, chunks, "spring_docs")
+            try:
+                await asyncio.to_thread(add_documents, chunks, "spring_docs")
+            except Exception as e:
+                # 임베딩 API/DB 오류는 일시적일 수 있으므로 재시도 대상으로 반환
+                logger.warning("  ! [Error] Failed to store %s: %s", url_link, e)
+                return page
+    return None
 
-async def run_ingestion_pipeline(url: str, category: str, max_pages: int = None):
+async def _collect_failed(tasks, desc):
+    """태스크 완료를 기다리며 저장에 실패한 페이지만 모아 반환"""
+    failed = []
+    # 로그 출력이 진행 바를 깨뜨리지 않도록 tqdm을 통해 출력
+    with logging_redirect_tqdm():
+        for f in tqdm(asyncio.as_completed(tasks), total=len(tasks), desc=desc):
+            if (page := await f) is not None:
+                failed.append(page)
+    return failed
+
+async def run_ingestion_pipeline(url: str, category: str, max_pages: int = None, concurrency: int = None):
     load_dotenv()
     print(f"=== Starting RAG Ingestion Pipeline ({category}) ===")
     
-    sem = asyncio.Semaphore(5)
+    if concurrency is None:
+        concurrency = int(os.getenv("INGEST_CONCURRENCY", DEFAULT_CONCURRENCY))
+    sem = asyncio.Semaphore(concurrency)
     tasks = []
 
     print("Fetching documents from crawler...")
-    for page in fetch_docs(url, max_pages=max_pages):
+    # 크롤러는 동기 제너레이터이므로 다음 페이지를 스레드에서 받아온다.
+    # 그 사이 이벤트 루프가 이미 스케줄된 페이지의 청킹/저장을 진행하여 크롤링과 겹쳐 처리됨
+    pages = fetch_docs(url, max_pages=max_pages)
+    while (page := await asyncio.to_thread(next, pages, None)) is not None:
         task = asyncio.create_task(process_page(sem, page, category))
         tasks.append(task)
         
     if tasks:
         print(f"\nScheduled {len(tasks)} tasks. Awaiting completion...")
-        for f in tqdm(asyncio.as_completed(tasks), total=len(tasks), desc="Processing Pages"):
-            await f
+        failed_pages = await _collect_failed(tasks, "Processing Pages")
+
+        # 전체를 다시 돌리지 않고 실패한 페이지만 재처리 (add_documents는 source 단위 upsert라 멱등)
+        for attempt in range(1, MAX_RETRIES + 1):
+            if not failed_pages:
+                break
+            print(f"\nRetrying {len(failed_pages)} failed pages (attempt {attempt}/{MAX_RETRIES})...")
+            retry_tasks = [asyncio.create_task(process_page(sem, page, category)) for page in failed_pages]
+            failed_pages = await _collect_failed(retry_tasks, "Retrying Pages")
+
+        if failed_pages:
+            print(f"\n{len(failed_pages)} pages could not be stored:")
+            for page in failed_pages:
+                print(f"  - {page['url']}")
     else:
         print("No pages found or crawled.")
 
     print("\n=== Ingestion Pipeline Completed ===")
 
 if __name__ == "__main__":
+    # 파이프라인 로그만 LOG_LEVEL로 출력 (httpx 등 라이브러리의 요청별 INFO 로그는 WARNING 이상만)
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    for name in ("pipeline", "__main__"):
+        logging.getLogger(name).setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
     print("select category")
     print("1. spring-boot")
     print("2. spring-data-jpa")
@@ -86,4 +139,5 @@ if __name__ == "__main__":
         sys.exit(1)
     
     print(f"Ingesting {category} docs from {url}")
-    asyncio.run(run_ingestion_pipeline(url, category))
+    runner = uvloop.run if uvloop is not None else asyncio.run
+    runner(run_ingestion_pipeline(url, category))
@@ -1,5 +1,14 @@
 import re
 
+HEADER_TAGS = frozenset({'h1', 'h2', 'h3', 'h4', 'h5', 'h6'})
+ADMONITION_TYPES = frozenset({'tip', 'note', 'important', 'warning', 'caution'})
+
+# Structural/container div classes to recurse into
+RECURSION_CLASSES = frozenset({
+    'sectionbody', 'preamble',
+    'sect1', 'sect2', 'sect3', 'sect4', 'sect5',
+    'openblock', 'content', 'tabpanel', 'tabs',
+})
 
 def parse_section_content(section_body):
     """
@@ -13,7 +22,7 @@ def parse_section_content(section_body):
 
     for element in section_body.children:
         # 0. Headers (h1-h6)
-        if element.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
+        if element.name in HEADER_TAGS:
             text = element.get_text(" ", strip=True)
             text = re.sub(r'\s+', ' ', text).strip()
             if text:
@@ -71,7 +80,7 @@ def parse_section_content(section_body):
             elif 'admonitionblock' in classes:
                 adm_type = 'note'
                 for c in classes:
-                    if c in ['tip', 'note', 'important', 'warning', 'caution']:
+                    if c in ADMONITION_TYPES:
                         adm_type = c
                         break
                 
@@ -93,17 +102,11 @@ def parse_section_content(section_body):
             # preamble, sect1-5, sectionbody, openblock, tabs, content, tabpanel
             # This ensures we penetrate all wrappers to find content
             else:
-                # Check known container classes or valid structure
-                recursion_targets = [
-                    'sectionbody', 'preamble', 
-                    'sect1', 'sect2', 'sect3', 'sect4', 'sect5',
-                    'openblock', 'content', 'tabpanel', 'tabs'
-                ]
-                
                 # Special case: id="preamble" might not have class
                 is_preamble = element.get('id') == 'preamble'
                 
-                if is_preamble or any(c in classes for c in recursion_targets):
+                # Check known container classes or valid structure
+                if is_preamble or not RECURSION_CLASSES.isdisjoint(classes):
                     inner_blocks = parse_section_content(element)
                     blocks.extend(inner_blocks)
                 
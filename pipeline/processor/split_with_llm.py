@@ -1,3 +1,4 @@
+from functools import lru_cache
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import PromptTemplate
 from langchain_core.documents import Document
@@ -34,6 +35,29 @@ class PageSections(BaseModel):
     """The structured output containing all sections of the page."""
     sections: List[Section]
 
+# Static instruction prefix shared by the sync/async splitters (page text is appended at the end)
+SPLIT_PROMPT_PREFIX = (
+    "You are a technical documentation processor specializing in RAG pipeline preparation.\n\n"
+    "## Goal\n"
+    "Split the documentation into chunks where each chunk can independently answer "
+    "a specific user question without requiring context from other chunks.\n\n"
+    "## Chunking Rules\n"
+    "1. Each chunk should represent only ONE distinct concept, behavior, or use case.\n"
+    "2. Aim for 100 to 300 words per chunk. "
+    "If a chunk would be shorter than 50 words, merge it with the most closely related adjacent chunk. "
+    "Prioritize topic coherence over meeting the size target, do not merge unrelated topics just to reach 100 words.\n"
+    "3. If a code example directly illustrates the preceding explanation, keep them in the SAME chunk.\n"
+    "4. If a code example is standalone or paired with minimal prose, it may be its own chunk.\n"
+    "5. If this chunk continues directly from the previous one, populate the context field "
+    "with a 1-sentence summary of what the previous chunk covered. Do not describe what comes next.\n\n"
+    "## Text to process\n"
+)
+
+@lru_cache(maxsize=None)
+def _get_structured_llm(model_name: str):
+    """Build the PageSections-bound LLM once per model and reuse it across pages."""
+    return ChatOpenAI(model=model_name, temperature=0).with_structured_output(PageSections)
+
 def split_text_with_llm(text, model_name="gpt-5-mini"):
     """
     Splits the full text into logical sections using an LLM.
@@ -43,26 +67,9 @@ def split_text_with_llm(text, model_name="gpt-5-mini"):
     if not text:
         return []
         
-    llm = ChatOpenAI(model=model_name, temperature=0)
-    structured_llm = llm.with_structured_output(PageSections)
+    structured_llm = _get_structured_llm(model_name)
     
-    prompt = (
-        "You are a technical documentation processor specializing in RAG pipeline preparation.\n\n"
-        "## Goal\n"
-        "Split the documentation into chunks where each chunk can independently answer "
-        "a specific user question without requiring context from other chunks.\n\n"
-        "## Chunking Rules\n"
-        "1. Each chunk should represent only ONE distinct concept, behavior, or use case.\n"
-        "2. Aim for 100 to 300 words per chunk. "
-        "If a chunk would be shorter than 50 words, merge it with the most closely related adjacent chunk. "
-        "Prioritize topic coherence over meeting the size target, do not merge unrelated topics just to reach 100 words.\n"
-        "3. If a code example directly illustrates the preceding explanation, keep them in the SAME chunk.\n"
-        "4. If a code example is standalone or paired with minimal prose, it may be its own chunk.\n"
-        "5. If this chunk continues directly from the previous one, populate the context field "
-        "with a 1-sentence summary of what the previous chunk covered. Do not describe what comes next.\n\n"
-        "## Text to process\n"
-        f"{text}"
-    )
+    prompt = SPLIT_PROMPT_PREFIX + text
     
     try:
         result = structured_llm.invoke(prompt)
@@ -105,26 +112,9 @@ async def split_text_with_llm_async(text, model_name="gpt-5-mini"):
     if not text:
         return []
         
-    llm = ChatOpenAI(model=model_name, temperature=0)
-    structured_llm = llm.with_structured_output(PageSections)
+    structured_llm = _get_structured_llm(model_name)
     
-    prompt = (
-        "You are a technical documentation processor specializing in RAG pipeline preparation.\n\n"
-        "## Goal\n"
-        "Split the documentation into chunks where each chunk can independently answer "
-        "a specific user question without requiring context from other chunks.\n\n"
-        "## Chunking Rules\n"
-        "1. Each chunk should represent only ONE distinct concept, behavior, or use case.\n"
-        "2. Aim for 100 to 300 words per chunk. "
-        "If a chunk would be shorter than 50 words, merge it with the most closely related adjacent chunk. "
-        "Prioritize topic coherence over meeting the size target, do not merge unrelated topics just to reach 100 words.\n"
-        "3. If a code example directly illustrates the preceding explanation, keep them in the SAME chunk.\n"
-        "4. If a code example is standalone or paired with minimal prose, it may be its own chunk.\n"
-        "5. If this chunk continues directly from the previous one, populate the context field "
-        "with a 1-sentence summary of what the previous chunk covered. Do not describe what comes next.\n\n"
-        "## Text to process\n"
-        f"{text}"
-    )
+    prompt = SPLIT_PROMPT_PREFIX + text
     
     try:
         result = await structured_llm.ainvoke(prompt)
@@ -1,7 +1,12 @@
+import os
+import asyncio
+import logging
 import threading
+import time
+from functools import lru_cache
 
-from tqdm import tqdm
 from langchain_core.documents import Document
+from langchain_core.rate_limiters import InMemoryRateLimiter
 from langchain_community.retrievers import BM25Retriever
 from langchain_classic.retrievers import EnsembleRetriever, ContextualCompressionRetriever
 from langchain_cohere import CohereRerank
@@ -9,9 +14,106 @@ import re
 
 from pipeline.storage import get_vectorstore
 
+logger = logging.getLogger(__name__)
+
 _vectorstore_lock = threading.Lock()
 _bm25_retrievers: dict = {}
 
+# Cohere 장애 시 매 요청마다 타임아웃을 기다리지 않도록 연속 실패 횟수 기준으로 리랭커를 차단
+RERANKER_FAIL_MAX = 5
+RERANKER_RESET_TIMEOUT = 30  # seconds
+
+
+class _CircuitBreaker:
+    """연속 실패가 fail_max에 도달하면 reset_timeout 동안 open 상태를 유지합니다."""
+
+    def __init__(self, fail_max: int, reset_timeout: float):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """reset_timeout이 지나지 않은 open 상태인지 여부 (상태를 변경하지 않음)"""
+        with self._lock:
+            return self._opened_at is not None and time.monotonic() - self._opened_at < self.reset_timeout
+
+    def allow_request(self) -> bool:
+        """요청 통과 여부를 반환합니다. half-open 상태에서는 시험 요청 하나만 통과시킵니다."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing:
+                # 시험 요청 실패: 다시 reset_timeout 동안 open
+                self._probing = False
+                self._opened_at = time.monotonic()
+            elif self._failures >= self.fail_max and self._opened_at is None:
+                self._opened_at = time.monotonic()
+                logger.warning(
+                    "Reranker circuit opened after %d consecutive failures (retry in %ss).",
+                    self._failures, self.reset_timeout,
+                )
+
+
+_reranker_breaker = _CircuitBreaker(RERANKER_FAIL_MAX, RERANKER_RESET_TIMEOUT)
+
+
+@lru_cache(maxsize=1)
+def _get_rerank_limiter():
+    """COHERE_RERANK_RPM이 설정된 경우 분당 요청 수에 맞춘 토큰 버킷을 반환합니다 (미설정 시 None)."""
+    rpm = os.getenv("COHERE_RERANK_RPM")
+    if not rpm:
+        return None
+    return InMemoryRateLimiter(requests_per_second=float(rpm) / 60, check_every_n_seconds=0.1)
+
+
+def _check_rerank_circuit(use_reranker: bool, fallback_on_rerank_error: bool) -> None:
+    """대체 결과를 허용하지 않는 호출은 차단 중일 때 검색 전에 바로 실패시킵니다."""
+    if use_reranker and not fallback_on_rerank_error and _reranker_breaker.is_open:
+        raise RuntimeError("Reranker circuit is open")
+
+
+def _rerank_allowed(fallback_on_rerank_error: bool) -> bool:
+    """리랭크 시도 여부를 반환합니다. 차단 중이면 대체 허용 시 False, 아니면 예외를 발생시킵니다."""
+    if _reranker_breaker.allow_request():
+        return True
+    if not fallback_on_rerank_error:
+        raise RuntimeError("Reranker circuit is open")
+    return False
+
+
+def _rerank_fallback(error: Exception, candidates: list[Document], fallback_on_rerank_error: bool) -> list[Document]:
+    """리랭크 실패 시 대체 허용이면 앙상블 결과를, 아니면 원래 예외를 전파합니다."""
+    if not fallback_on_rerank_error:
+        raise error
+    logger.warning("Rerank failed, falling back to ensemble results: %s", error)
+    return candidates
+
+
+def _on_rerank_result(ok: bool) -> None:
+    """리랭크 결과를 차단기에 기록합니다 (시험 요청이 취소되더라도 half-open 상태가 남지 않도록 항상 호출)."""
+    if ok:
+        _reranker_breaker.record_success()
+    else:
+        _reranker_breaker.record_failure()
+
 
 def get_hybrid_retriever(
     k: int = 3,
@@ -41,13 +143,13 @@ def get_hybrid_retriever(
     if bm25_key not in _bm25_retrievers:
         with _vectorstore_lock:
             if bm25_key not in _bm25_retrievers:
-                tqdm.write(f"Initializing BM25 Retriever (Key: {bm25_key})...")
+                logger.info("Initializing BM25 Retriever (Key: %s)...", bm25_key)
 
                 where_filter = {"category": category} if category else None
                 db_data = vectorstore.get(where=where_filter)
 
                 if not db_data or not db_data.get("documents"):
-                    tqdm.write(f"No documents found for BM25 key {bm25_key}.")
+                    logger.warning("No documents found for BM25 key %s.", bm25_key)
                     return chroma_retriever
 
                 docs = [
@@ -98,8 +200,15 @@ def query_hybrid(
     dense_weight: float = 0.7,
     sparse_weight: float = 0.3,
     use_reranker: bool = False,
+    fallback_on_rerank_error: bool = False,
 ) -> list[Document]:
-    """Hybrid Search(BM25 + Dense) 실행 후 상위 k개를 반환합니다."""
+    """
+    Hybrid Search(BM25 + Dense) 실행 후 상위 k개를 반환합니다.
+    fallback_on_rerank_error=True이면 리랭크 실패(차단 포함) 시 리랭크 전 앙상블 결과를 반환하고,
+    False이면 예외를 그대로 전파합니다 (리랭커 평가 시 결과가 섞이지 않도록).
+    """
+    _check_rerank_circuit(use_reranker, fallback_on_rerank_error)
+
     retriever = get_hybrid_retriever(
         k=k,
         category=category,
@@ -108,7 +217,76 @@ def query_hybrid(
         sparse_weight=sparse_weight,
         use_reranker=use_reranker,
     )
-    results = retriever.invoke(query) if hasattr(retriever, "invoke") else retriever.get_relevant_documents(query)
+    # BM25 문서가 없으면 리랭커 없이 Dense 검색기만 반환되므로 그대로 검색
+    if not isinstance(retriever, ContextualCompressionRetriever):
+        return retriever.invoke(query)[:k]
+
+    # 앙상블 검색 실패는 리랭커 장애가 아니므로 try/차단기 집계 밖에서 실행
+    candidates = retriever.base_retriever.invoke(query)
+    if not candidates:
+        return []
+
+    if not _rerank_allowed(fallback_on_rerank_error):
+        return candidates[:k]
+
+    reranked = False
+    try:
+        # 대기 중 취소되어도 finally에서 시험 요청 결과가 기록되도록 try 안에서 대기
+        if limiter := _get_rerank_limiter():
+            # 고정 대기 없이 버킷이 빈 경우에만 대기 (Cohere trial 키는 분당 호출 수 제한)
+            limiter.acquire()
+        results = list(retriever.base_compressor.compress_documents(candidates, query))
+        reranked = True
+    except Exception as e:
+        results = _rerank_fallback(e, candidates, fallback_on_rerank_error)
+    finally:
+        _on_rerank_result(reranked)
+    return results[:k]
+
+
+async def aquery_hybrid(
+    query: str,
+    k: int = 3,
+    category: str = None,
+    collection_name: str = "spring_docs",
+    dense_weight: float = 0.7,
+    sparse_weight: float = 0.3,
+    use_reranker: bool = False,
+    fallback_on_rerank_error: bool = False,
+) -> list[Document]:
+    """query_hybrid의 비동기 버전. Dense/BM25 검색을 이벤트 루프에서 동시에 실행합니다."""
+    _check_rerank_circuit(use_reranker, fallback_on_rerank_error)
+
+    # 최초 호출 시 BM25 구축(전체 컬렉션 get)이 락을 잡고 동기로 실행되므로 이벤트 루프 밖에서 수행
+    retriever = await asyncio.to_thread(
+        get_hybrid_retriever,
+        k=k,
+        category=category,
+        collection_name=collection_name,
+        dense_weight=dense_weight,
+        sparse_weight=sparse_weight,
+        use_reranker=use_reranker,
+    )
+    if not isinstance(retriever, ContextualCompressionRetriever):
+        return (await retriever.ainvoke(query))[:k]
+
+    candidates = await retriever.base_retriever.ainvoke(query)
+    if not candidates:
+        return []
+
+    if not _rerank_allowed(fallback_on_rerank_error):
+        return candidates[:k]
+
+    reranked = False
+    try:
+        if limiter := _get_rerank_limiter():
+            await limiter.aacquire()
+        results = list(await retriever.base_compressor.acompress_documents(candidates, query))
+        reranked = True
+    except Exception as e:
+        results = _rerank_fallback(e, candidates, fallback_on_rerank_error)
+    finally:
+        _on_rerank_result(reranked)
     return results[:k]
 
 def query_documents(query: str, k: int = 3, category: str = None, collection_name: str = "spring_docs") -> list:
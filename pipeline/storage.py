@@ -1,9 +1,11 @@
+import logging
 import threading
 
-from tqdm import tqdm
 from langchain_chroma import Chroma
 from langchain_openai import OpenAIEmbeddings
 
+logger = logging.getLogger(__name__)
+
 PERSIST_DIRECTORY = "./chroma_db"
 
 _vectorstore_lock = threading.Lock()
@@ -29,11 +31,11 @@ def get_vectorstore(collection_name: str = "spring_docs") -> Chroma:
 def add_documents(documents: list, collection_name: str = "spring_docs") -> None:
     """Document 리스트를 vectorstore에 upsert합니다 (source 기준 중복 제거)."""
     if not documents:
-        tqdm.write("No documents to add.")
+        logger.debug("No documents to add.")
         return
 
     vectorstore = get_vectorstore(collection_name)
-    tqdm.write(f"Adding {len(documents)} documents to ChromaDB ({collection_name})...")
+    logger.debug("Adding %d documents to ChromaDB (%s)...", len(documents), collection_name)
 
     url_link = documents[0].metadata["source"]
     result = vectorstore.get(where={"source": url_link})
@@ -42,7 +44,7 @@ def add_documents(documents: list, collection_name: str = "spring_docs") -> None
 
     ids = [doc.metadata["chunk_id"] for doc in documents]
     vectorstore.add_documents(documents=documents, ids=ids)
-    tqdm.write("Documents added successfully.")
+    logger.debug("Documents added successfully.")
 
 
 